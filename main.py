@@ -6,12 +6,28 @@ Version: 2.0 (Email optional)
 """
 
 import os
+import re
+import html
+import json
+import time
+import hashlib
+import calendar
+import functools
+import sqlite3
 import smtplib
+import traceback
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
-from typing import List, Dict
+from datetime import datetime, timezone
+from typing import List, Dict, Tuple
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
 import feedparser
+from feedparser.datetimes import _parse_date as _feedparser_parse_date
+import requests
+from requests.adapters import HTTPAdapter
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -25,6 +41,40 @@ RSS_FEEDS = [
     "https://news.mit.edu/rss/topic/artificial-intelligence"
 ]
 
+# Shared HTTP session so feed downloads reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+# Fixed instructions sent to Gemini as the system instruction, so per-request
+# prompts only carry the response format and the article text
+SYSTEM_PROMPT = """You are a DX Manager at a Japanese food manufacturing company. 
+Rate this AI news article on a scale of 1-10 for relevance. Prioritize:
+- General AI news and developments
+- AI applications in manufacturing and industrial automation
+- AI in food industry and food manufacturing
+- AI in factory operations and production
+- Any significant AI breakthroughs or innovations
+
+If relevance is > 7, write a one-sentence summary in Japanese and English."""
+
+RESPONSE_FORMAT = """Respond with a JSON object:
+{"relevance": [number 1-10], "summary": [if relevance > 7, one sentence in Japanese and English, otherwise "N/A"]}"""
+
+BATCH_RESPONSE_FORMAT = """You will be given several numbered articles. Rate each one independently.
+Respond with a JSON array containing exactly one object per article, in the same order:
+[{"relevance": [number 1-10], "summary": [if relevance > 7, one sentence in Japanese and English, otherwise "N/A"]}]"""
+
+# Structured output schemas so Gemini replies with parseable JSON
+RATING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "relevance": {"type": "integer"},
+        "summary": {"type": "string"}
+    },
+    "required": ["relevance", "summary"]
+}
+BATCH_RATING_SCHEMA = {"type": "array", "items": RATING_SCHEMA}
+
 # Initialize Gemini AI
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
@@ -32,7 +82,7 @@ if not GEMINI_API_KEY:
 
 try:
     genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.5-flash')
+    model = genai.GenerativeModel('gemini-2.5-flash', system_instruction=SYSTEM_PROMPT)
     print("✅ Using model: gemini-2.5-flash")
 except Exception as e:
     error_msg = str(e)
@@ -56,23 +106,55 @@ if not EMAIL_ENABLED:
     print("✅ Running with email disabled - this is expected if EMAIL_USER/EMAIL_PASSWORD secrets are not set.")
 
 
+# Placeholder title for entries that don't have one
+NO_TITLE = 'No Title'
+
+# Matches either a run of text (group 1) or markup when stripping feed snippets.
+# Comments and <script>/<style> blocks are consumed whole so their contents never
+# reach the text. A "<" only starts a tag when followed by a tag name, "/", "!" or
+# "?"; a stray "<" is kept as text.
+_HTML_TOKEN_RE = re.compile(
+    r'([^<]+|<(?![A-Za-z/!?]))'
+    r'|<!--.*?-->'
+    r'|<(script|style)\b.*?</\2\s*>'
+    r'|<[^>]*>?',
+    re.S | re.I
+)
+
+# Date formats tried (in order) before falling back to feedparser's parser
+_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%SZ',
+)
+
+
 def parse_date(date_string: str) -> datetime:
     """Parse various date formats from RSS feeds."""
-    try:
-        # Try parsing as struct_time (feedparser format)
-        if hasattr(date_string, 'tm_year'):
+    # Try parsing as struct_time (feedparser format)
+    if hasattr(date_string, 'tm_year'):
+        try:
             return datetime(*date_string[:6])
-        # Try parsing as string
+        except (TypeError, ValueError) as e:
+            print(f"Error parsing date: {date_string}, error: {e}")
+            return None
+    return _parse_date_string(date_string)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date_string(date_string: str) -> datetime:
+    """Parse a date string, memoized since feeds repeat the same strings."""
+    try:
+        # Try common formats
         if isinstance(date_string, str):
-            # Try common formats
-            for fmt in ['%a, %d %b %Y %H:%M:%S %Z', '%a, %d %b %Y %H:%M:%S %z', 
-                       '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%SZ']:
+            for fmt in _DATE_FORMATS:
                 try:
                     return datetime.strptime(date_string, fmt)
                 except ValueError:
                     continue
         # Fallback: use feedparser's parsed date
-        parsed = feedparser._parse_date(date_string)
+        parsed = _feedparser_parse_date(date_string)
         if parsed:
             return datetime(*parsed[:6])
     except Exception as e:
@@ -80,38 +162,40 @@ def parse_date(date_string: str) -> datetime:
     return None
 
 
-def is_recent_article(entry: Dict, hours: int = 24) -> bool:
-    """Check if article was published within the last N hours."""
-    article_date = None
-    
+def get_article_timestamp(entry: Dict) -> int:
+    """Get the article's publish time as a UTC Unix timestamp, or None if unknown."""
     if 'published_parsed' in entry and entry.published_parsed:
         try:
-            # feedparser provides struct_time, convert to datetime
-            article_date = datetime(*entry.published_parsed[:6])
+            # feedparser provides struct_time in UTC
+            return calendar.timegm(entry.published_parsed)
         except (TypeError, ValueError):
-            pass
+            return None
     elif 'published' in entry:
         article_date = parse_date(entry.published)
-    
-    if not article_date:
-        return False
-    
-    # Remove timezone info for comparison (assume UTC if not specified)
-    if article_date.tzinfo is not None:
-        article_date = article_date.replace(tzinfo=None)
-    
-    now = datetime.utcnow()  # Use UTC for consistency
-    time_diff = now - article_date
-    
-    # Check if within the time window
-    is_recent = time_diff <= timedelta(hours=hours) and time_diff >= timedelta(hours=0)
-    
-    return is_recent
+        if article_date:
+            # Naive datetimes are assumed to be UTC
+            return calendar.timegm(article_date.utctimetuple())
+    return None
+
+
+def strip_html(markup: str, limit: int) -> str:
+    """Extract text from HTML, stopping as soon as `limit` characters have been collected."""
+    parts = []
+    length = 0
+    for match in _HTML_TOKEN_RE.finditer(markup):
+        text = match.group(1)
+        if text:
+            text = html.unescape(text)
+            parts.append(text)
+            length += len(text)
+            if length >= limit:
+                break
+    return ''.join(parts)[:limit]
 
 
 def get_article_content(entry: Dict) -> tuple:
     """Extract title and snippet from RSS entry."""
-    title = entry.get('title', 'No Title')
+    title = entry.get('title', NO_TITLE)
     
     # Try to get description/summary
     snippet = entry.get('summary', '') or entry.get('description', '')
@@ -123,119 +207,451 @@ def get_article_content(entry: Dict) -> tuple:
     
     # Clean up HTML tags if present
     if snippet:
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(snippet, 'html.parser')
-        snippet = soup.get_text()[:500]  # Limit to 500 chars
+        snippet = strip_html(snippet, limit=500)  # Limit to 500 chars
     
     return title, snippet
 
 
+# Number of articles scored per Gemini request
+BATCH_SIZE = 10
+# Maximum number of Gemini requests in flight at once
+GEMINI_MAX_WORKERS = 8
+
+
+# On-disk cache of Gemini ratings so articles seen on previous runs are not re-scored
+CACHE_DB = "gemini_cache.db"
+CACHE_TTL_DAYS = 30
+
+
+def open_rating_cache() -> sqlite3.Connection:
+    """Open (and create if needed) the Gemini rating cache."""
+    cache = sqlite3.connect(CACHE_DB)
+    cache.execute(
+        "CREATE TABLE IF NOT EXISTS ratings "
+        "(key TEXT PRIMARY KEY, relevance INT, summary TEXT, ts INT)"
+    )
+    return cache
+
+
+def rating_cache_key(title: str, snippet: str) -> str:
+    """Build the cache key for an article."""
+    return hashlib.sha256((title + "\x00" + snippet).encode()).hexdigest()
+
+
+def get_cached_rating(cache: sqlite3.Connection, title: str, snippet: str):
+    """Return a cached (relevance, summary) for the article, or None if missing/expired."""
+    min_ts = int(time.time()) - CACHE_TTL_DAYS * 86400
+    row = cache.execute(
+        "SELECT relevance, summary FROM ratings WHERE key = ? AND ts > ?",
+        (rating_cache_key(title, snippet), min_ts)
+    ).fetchone()
+    return tuple(row) if row else None
+
+
+def store_rating(cache: sqlite3.Connection, title: str, snippet: str, relevance: int, summary: str):
+    """Save a Gemini rating to the cache (committed by the caller)."""
+    cache.execute(
+        "INSERT OR REPLACE INTO ratings (key, relevance, summary, ts) VALUES (?, ?, ?, ?)",
+        (rating_cache_key(title, snippet), relevance, summary, int(time.time()))
+    )
+
+
+def report_gemini_error(e: Exception):
+    """Print a readable message for a failed Gemini API call."""
+    error_msg = str(e)
+    if "API key" in error_msg or "API_KEY" in error_msg:
+        print(f"    ❌ API Key Error: Please check your GEMINI_API_KEY secret in GitHub settings")
+    else:
+        print(f"    ⚠️  Error calling Gemini API: {error_msg[:100]}")
+
+
 def rate_and_summarize(title: str, snippet: str) -> tuple:
     """Use Gemini AI to rate relevance and generate summary if relevant."""
-    system_prompt = """You are a DX Manager at a Japanese food manufacturing company. 
-Rate this AI news article on a scale of 1-10 for relevance. Prioritize:
-- General AI news and developments
-- AI applications in manufacturing and industrial automation
-- AI in food industry and food manufacturing
-- AI in factory operations and production
-- Any significant AI breakthroughs or innovations
+    prompt = f"{RESPONSE_FORMAT}\n\nTitle: {title}\n\nSnippet: {snippet}"
+    
+    try:
+        response = model.generate_content(
+            prompt,
+            generation_config={"response_mime_type": "application/json", "response_schema": RATING_SCHEMA}
+        )
+        result = json.loads(response.text)
+        
+        return int(result.get('relevance', 0)), str(result.get('summary', '')).strip()
+    except Exception as e:
+        report_gemini_error(e)
+        return 0, ""
 
-If relevance is > 7, write a one-sentence summary in Japanese and English.
 
-Format your response as:
-RELEVANCE: [number 1-10]
-SUMMARY: [if relevance > 7, provide one sentence in Japanese and English, otherwise "N/A"]"""
+def rate_and_summarize_batch(items: List[Tuple[str, str]]) -> List[Tuple[int, str]]:
+    """Rate and summarize several (title, snippet) pairs with a single Gemini request.
 
-    prompt = f"{system_prompt}\n\nTitle: {title}\n\nSnippet: {snippet}"
+    Falls back to one request per article if the batched response cannot be parsed.
+    """
+    articles_text = "\n\n".join(
+        f"Article {i}:\nTitle: {title}\nSnippet: {snippet}"
+        for i, (title, snippet) in enumerate(items, 1)
+    )
+    prompt = f"{BATCH_RESPONSE_FORMAT}\n\n{articles_text}"
     
     try:
-        response = model.generate_content(prompt)
-        response_text = response.text
+        response = model.generate_content(
+            prompt,
+            generation_config={"response_mime_type": "application/json", "response_schema": BATCH_RATING_SCHEMA}
+        )
+        results = json.loads(response.text)
+        if not isinstance(results, list) or len(results) != len(items):
+            raise ValueError(f"expected {len(items)} results, got {len(results) if isinstance(results, list) else 'non-list'}")
         
-        # Parse response
-        relevance = 0
-        summary = ""
-        
-        for line in response_text.split('\n'):
-            if line.startswith('RELEVANCE:'):
-                try:
-                    relevance = int(line.split(':')[1].strip())
-                except:
-                    pass
-            elif line.startswith('SUMMARY:'):
-                summary = line.split(':', 1)[1].strip() if ':' in line else ""
+        return [(int(result.get('relevance', 0)), str(result.get('summary', '')).strip()) for result in results]
+    except (ValueError, TypeError, AttributeError) as e:
+        print(f"    ⚠️  Could not parse batched response ({str(e)[:100]}), scoring individually")
+        return [rate_and_summarize(title, snippet) for title, snippet in items]
+    except Exception as e:
+        # API failures (quota, auth, timeouts) would only repeat per article - don't retry
+        report_gemini_error(e)
+        return [(0, "")] * len(items)
+
+
+# Topics from the rating prompt; articles mentioning none of these are not sent to Gemini.
+# Stems are matched anywhere, so inflected forms ("robotics", "agentic") still count.
+RELEVANCE_KEYWORDS = (
+    'artificial intelligence', 'machine learning', 'deep learning', 'neural',
+    'openai', 'genai', 'gemini', 'generative', 'agent', 'model', 'robot', 'automat',
+    'manufactur', 'factory', 'factories', 'industr', 'production', 'food',
+    'appsheet', 'workspace', 'workflow',
+)
+# Short acronyms only count when no ASCII letter touches them, so "AI-powered" and
+# "生成AI" match but "said", "email" and "available" don't
+RELEVANCE_ACRONYMS = ('ai', 'llm', 'llms', 'ocr')
+_KEYWORD_RE = re.compile(
+    '|'.join(re.escape(k) for k in RELEVANCE_KEYWORDS)
+    + r'|(?<![a-z])(?:' + '|'.join(RELEVANCE_ACRONYMS) + r')(?![a-z])'
+)
+
+
+def matches_keywords(title: str, snippet: str) -> bool:
+    """Check whether an article mentions any topic we care about."""
+    return bool(_KEYWORD_RE.search(f"{title} {snippet}".lower()))
+
+
+def canonical_link(link: str) -> str:
+    """Normalize an article URL for duplicate detection (drops query and fragment)."""
+    if not link:
+        return ''
+    return urlsplit(link.strip())._replace(query='', fragment='').geturl()
+
+
+def normalize_title(title: str) -> str:
+    """Normalize an article title for duplicate detection ('' for missing titles)."""
+    if title == NO_TITLE:
+        return ''
+    return unicodedata.normalize('NFKC', title).casefold().strip()
+
+
+# Per-feed ETag/Last-Modified values and the recent articles seen on the last run,
+# so unchanged feeds can be skipped with a conditional GET
+FEED_STATE_FILE = "feed_state.json"
+
+
+def load_feed_state() -> Dict:
+    """Load saved feed state, or an empty dict on the first run."""
+    try:
+        with open(FEED_STATE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_feed_state(feed_state: Dict):
+    """Write feed state for the next run."""
+    try:
+        with open(FEED_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(feed_state, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠️  Could not save feed state: {e}")
+
+
+# XML namespaces used when stream-parsing Atom feeds and RSS content:encoded
+_ATOM_NS = '{http://www.w3.org/2005/Atom}'
+_CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+
+
+class UnsupportedFeedError(ValueError):
+    """Raised when a feed is valid XML but not in a format the streaming parser handles."""
+
+
+def _element_to_entry(elem: ElementTree.Element) -> Dict:
+    """Convert an RSS <item> or Atom <entry> element to a feedparser-style entry."""
+    if elem.tag == 'item':
+        published = elem.findtext('pubDate', '')
+        title = elem.findtext('title')
+        entry = feedparser.FeedParserDict(
+            link=elem.findtext('link', ''),
+            summary=elem.findtext('description', ''),
+        )
+        content = elem.findtext(_CONTENT_NS + 'encoded')
+    else:
+        published = elem.findtext(_ATOM_NS + 'published') or elem.findtext(_ATOM_NS + 'updated', '')
+        link = ''
+        for link_elem in elem.findall(_ATOM_NS + 'link'):
+            if link_elem.get('rel', 'alternate') == 'alternate':
+                link = link_elem.get('href', '')
+                break
+        title = elem.findtext(_ATOM_NS + 'title')
+        entry = feedparser.FeedParserDict(
+            link=link,
+            summary=elem.findtext(_ATOM_NS + 'summary', ''),
+        )
+        content = elem.findtext(_ATOM_NS + 'content')
+    
+    # Leave title unset when missing so get_article_content's default applies
+    if title is not None:
+        entry['title'] = title
+    if content:
+        entry['content'] = [{'value': content}]
+    if published:
+        entry['published'] = published
+        entry['published_parsed'] = _feedparser_parse_date(published)
+    return entry
+
+
+def stream_recent_entries(source, cutoff_ts: int):
+    """Stream-parse an RSS/Atom document, yielding entries until the first one older than cutoff_ts.
+
+    Feeds list entries newest first, so the rest of the document is never parsed.
+    Raises UnsupportedFeedError if the document has no RSS <item> or Atom <entry>
+    elements (e.g. RSS 1.0/RDF), so the caller can fall back to feedparser.
+    """
+    found_entry = False
+    for _, elem in ElementTree.iterparse(source, events=('end',)):
+        if elem.tag != 'item' and elem.tag != _ATOM_NS + 'entry':
+            continue
+        found_entry = True
+        entry = _element_to_entry(elem)
+        elem.clear()  # Keep memory bounded to one entry
         
-        return relevance, summary
+        article_ts = get_article_timestamp(entry)
+        if article_ts is not None and article_ts < cutoff_ts:
+            break
+        yield entry
+    
+    if not found_entry:
+        raise UnsupportedFeedError("no RSS <item> or Atom <entry> elements found")
+
+
+def fetch_feed(feed_url: str, saved_state: Dict, cutoff_ts: int):
+    """Download and parse a single RSS feed (runs in a worker thread)."""
+    headers = {}
+    if saved_state.get('etag'):
+        headers['If-None-Match'] = saved_state['etag']
+    if saved_state.get('modified'):
+        headers['If-Modified-Since'] = saved_state['modified']
+    
+    try:
+        with SESSION.get(feed_url, headers=headers, stream=True, timeout=10) as resp:
+            resp.raise_for_status()
+            feed = feedparser.FeedParserDict(
+                status=resp.status_code,
+                etag=resp.headers.get('ETag'),
+                modified=resp.headers.get('Last-Modified'),
+                entries=[]
+            )
+            if resp.status_code != 304:
+                resp.raw.decode_content = True
+                feed['entries'] = list(stream_recent_entries(resp.raw, cutoff_ts))
+        return feed, None
+    except (ElementTree.ParseError, UnsupportedFeedError) as e:
+        # Malformed XML or an unsupported format - let feedparser handle it
+        print(f"  ⚠️  Could not stream-parse {feed_url} ({e}), falling back to feedparser")
+        try:
+            resp = SESSION.get(feed_url, timeout=10)
+            resp.raise_for_status()
+            feed = feedparser.parse(resp.content)
+            feed['etag'] = resp.headers.get('ETag')
+            feed['modified'] = resp.headers.get('Last-Modified')
+            return feed, None
+        except Exception as e:
+            return None, e
     except Exception as e:
-        error_msg = str(e)
-        if "API key" in error_msg or "API_KEY" in error_msg:
-            print(f"    ❌ API Key Error: Please check your GEMINI_API_KEY secret in GitHub settings")
-        else:
-            print(f"    ⚠️  Error calling Gemini API: {error_msg[:100]}")
-        return 0, ""
+        return None, e
 
 
 def scan_feeds() -> List[Dict]:
     """Scan all RSS feeds and return relevant articles."""
     relevant_articles = []
-    all_processed = []
+    candidates = []
+    feed_state = load_feed_state()
+    
+    # Recency window is fixed for the whole scan, as Unix timestamps so the
+    # per-entry check is a plain integer comparison
+    now_ts = int(time.time())
+    cutoff_ts = now_ts - 168 * 3600  # 7 days (168 hours)
+    
+    # Fetch feeds concurrently - downloading is IO-bound
+    with ThreadPoolExecutor(max_workers=min(8, len(RSS_FEEDS))) as executor:
+        futures = {
+            executor.submit(fetch_feed, feed_url, feed_state.get(feed_url, {}), cutoff_ts): feed_url
+            for feed_url in RSS_FEEDS
+        }
+        # Collect in RSS_FEEDS order so logs and duplicate resolution are deterministic
+        fetched = [(feed_url, future.result()) for future, feed_url in futures.items()]
     
-    for feed_url in RSS_FEEDS:
+    for feed_url, (feed, fetch_error) in fetched:
         print(f"Scanning feed: {feed_url}")
-        feed_count = 0
+        feed_articles = []
         try:
-            feed = feedparser.parse(feed_url)
-            total_entries = len(feed.entries) if feed.entries else 0
-            print(f"  Found {total_entries} total entries in feed")
+            if fetch_error:
+                raise fetch_error
             
-            # Show most recent article date for debugging
-            if total_entries > 0:
-                most_recent = None
-                for entry in feed.entries[:3]:  # Check first 3 entries
-                    if 'published_parsed' in entry and entry.published_parsed:
-                        article_date = datetime(*entry.published_parsed[:6])
-                        if not most_recent or article_date > most_recent:
-                            most_recent = article_date
+            if feed.get('status') == 304:
+                # Feed unchanged since the last run - reuse the articles saved from it
+                saved_articles = feed_state[feed_url].get('articles', [])
+                feed_articles = [
+                    article for article in saved_articles
+                    if article.get('published_ts', 0) >= cutoff_ts
+                ]
+                feed_state[feed_url]['articles'] = feed_articles
+                print(f"  Feed not modified since last run")
+            else:
+                total_entries = len(feed.entries) if feed.entries else 0
+                print(f"  Read {total_entries} entries from feed")
                 
-                if most_recent:
-                    hours_ago = (datetime.now() - most_recent.replace(tzinfo=None)).total_seconds() / 3600
-                    print(f"  Most recent article: {most_recent.strftime('%Y-%m-%d %H:%M:%S')} ({hours_ago:.1f} hours ago)")
-            
-            for entry in feed.entries:
-                if is_recent_article(entry, hours=168):  # 7 days (168 hours)
-                    feed_count += 1
-                    title, snippet = get_article_content(entry)
-                    link = entry.get('link', '')
+                # Show most recent article date for debugging
+                if total_entries > 0:
+                    most_recent = None
+                    for entry in feed.entries[:3]:  # Check first 3 entries
+                        article_ts = get_article_timestamp(entry)
+                        if article_ts is not None and (most_recent is None or article_ts > most_recent):
+                            most_recent = article_ts
+                    
+                    if most_recent is not None:
+                        hours_ago = (now_ts - most_recent) / 3600
+                        most_recent_date = datetime.fromtimestamp(most_recent, timezone.utc)
+                        print(f"  Most recent article: {most_recent_date.strftime('%Y-%m-%d %H:%M:%S')} ({hours_ago:.1f} hours ago)")
+                
+                for entry in feed.entries:
+                    article_ts = get_article_timestamp(entry)
+                    if article_ts is None or article_ts > now_ts:
+                        continue
+                    if article_ts < cutoff_ts:
+                        # Feeds are ordered newest first, so the remaining entries are older too
+                        break
                     
-                    print(f"  Processing: {title[:50]}...")
-                    relevance, summary = rate_and_summarize(title, snippet)
+                    title, snippet = get_article_content(entry)
                     
-                    article_info = {
+                    feed_articles.append({
                         'title': title,
-                        'link': link,
-                        'relevance': relevance,
-                        'summary': summary,
-                        'source': feed_url
-                    }
-                    all_processed.append(article_info)
-                    
-                    if relevance > 7:
-                        relevant_articles.append(article_info)
-                        print(f"    ✓ Relevant (score: {relevance}/10)")
-                    else:
-                        print(f"    - Not relevant (score: {relevance}/10)")
+                        'link': entry.get('link', ''),
+                        'snippet': snippet,
+                        'source': feed_url,
+                        'published_ts': article_ts
+                    })
+                
+                feed_state[feed_url] = {
+                    'etag': feed.get('etag'),
+                    'modified': feed.get('modified'),
+                    'articles': feed_articles
+                }
             
-            if feed_count == 0:
+            candidates.extend(feed_articles)
+            if not feed_articles:
                 print(f"  ⚠️  No articles found from the last 7 days")
             else:
-                print(f"  ✓ Processed {feed_count} article(s) from last 7 days")
+                print(f"  ✓ Found {len(feed_articles)} article(s) from last 7 days")
         except Exception as e:
             print(f"  ❌ Error processing feed {feed_url}: {e}")
-            import traceback
             traceback.print_exc()
     
+    save_feed_state(feed_state)
+    
+    # The same story is often syndicated to several feeds - only score it once
+    seen = set()
+    unique_candidates = []
+    for candidate in candidates:
+        keys = {canonical_link(candidate['link']), normalize_title(candidate['title'])}
+        keys.discard('')
+        if keys & seen:
+            continue
+        seen |= keys
+        unique_candidates.append(candidate)
+    if len(unique_candidates) < len(candidates):
+        print(f"\nSkipped {len(candidates) - len(unique_candidates)} duplicate article(s)")
+    candidates = unique_candidates
+    
+    # Cheap keyword prefilter - articles matching none of the topics can't score highly
+    keyword_matches = []
+    for candidate in candidates:
+        if matches_keywords(candidate['title'], candidate['snippet']):
+            keyword_matches.append(candidate)
+        else:
+            print(f"  Skipped (no relevant keywords): {candidate['title'][:50]}...")
+    if len(keyword_matches) < len(candidates):
+        print(f"Skipped {len(candidates) - len(keyword_matches)} article(s) with no relevant keywords")
+    candidates = keyword_matches
+    
+    # Reuse ratings from previous runs where possible
+    cache = open_rating_cache()
+    ratings = {}  # candidate index -> (relevance, summary)
+    to_score = []
+    for index, candidate in enumerate(candidates):
+        cached = get_cached_rating(cache, candidate['title'], candidate['snippet'])
+        if cached:
+            ratings[index] = cached
+        else:
+            to_score.append(index)
+    print(f"\n{len(ratings)} article(s) already rated in cache")
+    
+    # Score remaining articles in batches to cut down on Gemini round-trips,
+    # keeping several batches in flight at once
+    batches = [to_score[start:start + BATCH_SIZE] for start in range(0, len(to_score), BATCH_SIZE)]
+    print(f"Scoring {len(to_score)} article(s) in {len(batches)} batch(es)...")
+    
+    with ThreadPoolExecutor(max_workers=GEMINI_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                rate_and_summarize_batch,
+                [(candidates[i]['title'], candidates[i]['snippet']) for i in batch]
+            ): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                report_gemini_error(e)
+                results = [(0, "")] * len(batch)
+            
+            for index, (relevance, summary) in zip(batch, results):
+                candidate = candidates[index]
+                # A score of 0 means the Gemini call failed - don't cache it
+                if relevance > 0:
+                    store_rating(cache, candidate['title'], candidate['snippet'], relevance, summary)
+                ratings[index] = (relevance, summary)
+    
+    cache.commit()
+    cache.close()
+    
+    # Report in candidate order, regardless of which batch finished first
+    for index, candidate in enumerate(candidates):
+        relevance, summary = ratings[index]
+        article_info = {
+            'title': candidate['title'],
+            'link': candidate['link'],
+            'relevance': relevance,
+            'summary': summary,
+            'source': candidate['source']
+        }
+        
+        print(f"  Processed: {candidate['title'][:50]}...")
+        if relevance > 7:
+            relevant_articles.append(article_info)
+            print(f"    ✓ Relevant (score: {relevance}/10)")
+        else:
+            print(f"    - Not relevant (score: {relevance}/10)")
+    
     # Summary
-    print(f"\n📊 Summary: Processed {len(all_processed)} total articles, {len(relevant_articles)} relevant (score > 7)")
+    print(f"\n📊 Summary: Processed {len(candidates)} total articles, {len(relevant_articles)} relevant (score > 7)")
     
     return relevant_articles
 
@@ -253,17 +669,17 @@ def send_email_report(articles: List[Dict]):
     # Create email content
     subject = "🤖 Chikuya DX: Weekly AI Updates"
     
-    html_body = f"""
+    parts = [f"""
     <html>
     <head></head>
     <body>
         <h2>Chikuya DX AI Scanner - Weekly Report</h2>
         <p>Found {len(articles)} relevant AI news items from the last 7 days:</p>
         <ul>
-    """
+    """]
     
     for article in articles:
-        html_body += f"""
+        parts.append(f"""
         <li>
             <strong><a href="{article['link']}">{article['title']}</a></strong><br>
             <em>Relevance Score: {article['relevance']}/10</em><br>
@@ -271,15 +687,16 @@ def send_email_report(articles: List[Dict]):
             <small>Source: {article['source']}</small>
         </li>
         <br>
-        """
+        """)
     
-    html_body += """
+    parts.append("""
         </ul>
         <p>---</p>
         <p><small>This is an automated report from Chikuya DX AI Scanner</small></p>
     </body>
     </html>
-    """
+    """)
+    html_body = ''.join(parts)
     
     # Create message
     msg = MIMEMultipart('alternative')